@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Remove debug log statements and sensitive log lines from Kotlin sources.
+
+This script walks the Android source tree, strips Log.d(...) debug
+statements, and removes log lines that would leak sensitive data
+(queried domain names, peer IP addresses, long hex hashes) into
+release builds.
+
+Usage:
+    python scripts/clean_logs.py [source_dir]
+
+If source_dir is not provided, defaults to:
+    android/app/src/main/java
+"""
+
+import mmap
+import os
+import re
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+
+# Patterns for sensitive data that must not appear in release logs.
+# Kotlin sources are effectively ASCII, so everything operates on bytes:
+# no UTF-8 decode of file content and no per-line str allocation.
+DOMAIN_PATTERN = rb'\b[a-z0-9](?:[a-z0-9-]*[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]*[a-z0-9])?)+\b'
+IP_PATTERN = rb'\b(?:\d{1,3}\.){3}\d{1,3}\b'
+IPV6_PATTERN = rb'\b(?:[0-9a-fA-F]{1,4}:){2,7}[0-9a-fA-F]{1,4}\b'
+LOG_PATTERN = rb'^\s*(?:android\.util\.)?Log\.d\('
+
+# IPs the app ships with (public resolvers, loopback) - fine to log
+WHITELISTED_IPS = (b'9.9.9.9', b'1.1.1.1', b'127.0.0.1', b'0.0.0.0')
+
+# Domain-looking strings that are fine to keep: fully-qualified Log
+# calls and the infrastructure baked into the app. Package/import lines
+# and comments are scrubbed before scanning, so their dotted names no
+# longer need entries here.
+EXCLUDED_DOMAINS = [
+    b'android.util',
+    b'cloudflare-dns.com',
+    b'hnsdoh.com',
+    b'quad9.net',
+]
+
+# Compiled once at import so the per-line hot path never goes through
+# the re module's pattern cache
+_LOG_RE = re.compile(LOG_PATTERN)
+
+# The exclusion list as one alternation: a single C-level scan of the
+# matched domain instead of a Python generator over nine substring checks
+_EXCLUDED_RE = re.compile(b'|'.join(re.escape(excluded) for excluded in EXCLUDED_DOMAINS))
+
+# All sensitive-data patterns merged into one alternation so each line is
+# scanned by the regex engine once; dispatch on match.lastgroup. IPs come
+# before domains because an IPv4 address also matches DOMAIN_PATTERN.
+_SENSITIVE_RE = re.compile(
+    b'(?P<ip>' + IP_PATTERN + b')'
+    b'|(?P<ipv6>' + IPV6_PATTERN + b')'
+    rb'|(?P<hash>\b[0-9a-fA-F]{32,}\b)'
+    b'|(?P<domain>' + DOMAIN_PATTERN + b')',
+    re.IGNORECASE,
+)
+
+# Matches a whole Log.d line (including its newline) so debug statements
+# can be stripped from a file in a single C-level pass
+_LOG_LINE_RE = re.compile(rb'^[ \t]*(?:android\.util\.)?Log\.d\([^\n]*\n?', re.MULTILINE)
+
+# Blanks // comments and package/import lines (newlines preserved) so
+# the sensitive scan never sees their harmless domain-like strings
+_COMMENT_RE = re.compile(rb'//[^\n]*|^[ \t]*(?:package|import)[ \t][^\n]*', re.MULTILINE)
+
+
+def contains_sensitive_data(line):
+    """
+    Check whether a log line leaks sensitive data: a non-whitelisted
+    IP address, a long hex run (block hash, key), or a queried domain.
+    """
+    # Cheap pretest: every IP, and any realistic hash, contains a digit,
+    # and every domain contains a dot. Most source lines have neither,
+    # so this skips the regex engine entirely.
+    has_digit = any(ch in b'0123456789' for ch in line)
+    if not has_digit and b'.' not in line:
+        return False
+
+    # Lower once up front; the domain branch reuses it for every match
+    line_lower = line.lower()
+
+    # Single pass of the merged alternation; branch on which group hit
+    for match in _SENSITIVE_RE.finditer(line):
+        kind = match.lastgroup
+        if kind == 'ip':
+            # IPv4 addresses (whitelist the resolvers we ship with)
+            if match.group(0) not in WHITELISTED_IPS:
+                return True
+        elif kind in ('ipv6', 'hash'):
+            # Peer addresses, block hashes, keys
+            if has_digit:
+                return True
+        else:
+            # Domain names - only flag lines that look like they log a query
+            domain = match.group(0).lower()
+            if not _EXCLUDED_RE.search(domain):
+                if b'domain' in line_lower or b'name' in line_lower:
+                    return True
+
+    return False
+
+
+def is_log_statement(line):
+    """Check whether a line is a Log.d debug statement."""
+    # LOG_PATTERN already eats leading whitespace, so no per-call strip
+    return _LOG_RE.match(line) is not None
+
+
+def clean_file(file_path):
+    """
+    Remove debug logs and sensitive log lines from one Kotlin file.
+    Returns (file_path, removed_count); the caller reports results.
+    """
+    # Map the file read-only and run the regexes on the raw bytes; the
+    # kernel pages data in lazily and no line list is materialized
+    with open(file_path, 'rb') as f:
+        f.seek(0, 2)
+        if f.tell() == 0:
+            return file_path, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Most files log nothing at all; one C-level substring scan
+            # of the map rules them out before any regex work (mmap has
+            # no __contains__, so use .find)
+            if mm.find(b'Log.') == -1:
+                return file_path, 0
+
+            # Strip all Log.d debug statements in one pass over the whole
+            # file, counting removals via subn
+            new_content, removed_count = _LOG_LINE_RE.subn(b'', mm)
+
+    # Drop remaining log lines that leak sensitive data. Rather than a
+    # Python loop over every line, hop between 'Log.' occurrences with
+    # C-level find and examine only those candidate lines (scrubbed of
+    # comments/imports); non-candidate lines are never touched.
+    drop_spans = []
+    pos = new_content.find(b'Log.')
+    while pos != -1:
+        line_start = new_content.rfind(b'\n', 0, pos) + 1
+        line_end = new_content.find(b'\n', pos)
+        line_end = len(new_content) if line_end == -1 else line_end + 1
+        line = _COMMENT_RE.sub(b'', new_content[line_start:line_end])
+        if b'Log.' in line and contains_sensitive_data(line):
+            drop_spans.append((line_start, line_end))
+        pos = new_content.find(b'Log.', line_end)
+
+    if drop_spans:
+        kept = []
+        prev = 0
+        for line_start, line_end in drop_spans:
+            kept.append(new_content[prev:line_start])
+            prev = line_end
+        kept.append(new_content[prev:])
+        new_content = b''.join(kept)
+        removed_count += len(drop_spans)
+
+    # Nothing removed: skip the write syscalls entirely
+    if removed_count == 0:
+        return file_path, 0
+
+    # Write to a temp file and rename over the original - one atomic
+    # replace instead of a truncate+write that could leave a torn file
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(new_content)
+    os.replace(tmp_path, file_path)
+
+    return file_path, removed_count
+
+
+def find_kotlin_files(root):
+    """
+    Recursively collect .kt file paths under root. Uses os.scandir so
+    the directory listing's cached stat data is reused - no extra stat
+    call or Path object per entry like Path.rglob.
+    """
+    kotlin_files = []
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.kt') and entry.is_file():
+                    kotlin_files.append(entry.path)
+    return kotlin_files
+
+
+def main():
+    # Default paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    if len(sys.argv) >= 2:
+        target_dir = Path(sys.argv[1])
+    else:
+        target_dir = project_root / "android" / "app" / "src" / "main" / "java"
+
+    # Validate source directory exists
+    if not target_dir.exists():
+        print(f"Error: Source directory not found: {target_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    kotlin_files = find_kotlin_files(target_dir)
+    print(f"Scanning {len(kotlin_files)} Kotlin file(s) in {target_dir}")
+
+    # Files are independent, so clean them across all cores
+    with Pool() as pool:
+        results = pool.imap_unordered(clean_file, kotlin_files, chunksize=4)
+        cleaned = [(path, count) for path, count in results if count]
+
+    # One buffered write instead of a print (and stdio lock) per file;
+    # this also keeps worker output from interleaving
+    report = [f"Cleaned {path}: removed {count} log line(s)" for path, count in cleaned]
+    report.append(f"Done: cleaned {len(cleaned)} of {len(kotlin_files)} file(s)")
+    sys.stdout.write('\n'.join(report) + '\n')
+
+
+if __name__ == "__main__":
+    main()
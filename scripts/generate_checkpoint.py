@@ -17,57 +17,63 @@ import sys
 import os
 from pathlib import Path
 
+# Pattern to match hex escape sequences: \x followed by 2 hex digits,
+# compiled once on bytes so the header never needs decoding to str
+_HEX_ESC_RE = re.compile(rb'\\x([0-9a-fA-F]{2})')
+
 
 def extract_hex_strings(content):
     """
-    Extract all hex string literals from the checkpoint array.
-    Handles strings like "\x00\x02\x13\x40" and concatenates them.
+    Extract all hex string literals from the checkpoint array content
+    (as bytes). Handles strings like "\x00\x02\x13\x40" and
+    concatenates them.
     """
-    # Pattern to match hex escape sequences: \x followed by 2 hex digits
-    hex_pattern = r'\\x([0-9a-fA-F]{2})'
-    
     # Find all hex escape sequences in the content
-    matches = re.findall(hex_pattern, content)
-    
-    # Convert hex strings to bytes
-    bytes_data = bytes([int(hex_str, 16) for hex_str in matches])
-    
+    matches = _HEX_ESC_RE.findall(content)
+
+    # Convert hex strings to bytes in one C-level bulk parse
+    bytes_data = bytes.fromhex(b''.join(matches).decode('ascii'))
+
     return bytes_data
 
 
 def extract_checkpoint_array(file_path):
     """
     Extract the HSK_CHECKPOINT_MAIN array content from checkpoints.h
+    as bytes. The header is pure ASCII, so it is read in binary mode
+    to skip UTF-8 decoding.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
+    with open(file_path, 'rb') as f:
         content = f.read()
-    
+
     # Find the array definition
     # Pattern: static const uint8_t HSK_CHECKPOINT_MAIN[...] = { ... };
-    array_start = content.find('HSK_CHECKPOINT_MAIN[')
+    array_start = content.find(b'HSK_CHECKPOINT_MAIN[')
     if array_start == -1:
         raise ValueError("Could not find HSK_CHECKPOINT_MAIN array in file")
-    
+
     # Find the opening brace after the array declaration
-    brace_start = content.find('{', array_start)
+    brace_start = content.find(b'{', array_start)
     if brace_start == -1:
         raise ValueError("Could not find opening brace for HSK_CHECKPOINT_MAIN array")
-    
-    # Find the closing brace (matching the opening one)
-    brace_count = 0
-    brace_end = brace_start
-    
-    for i in range(brace_start, len(content)):
-        if content[i] == '{':
-            brace_count += 1
-        elif content[i] == '}':
-            brace_count -= 1
-            if brace_count == 0:
-                brace_end = i
-                break
-    
-    if brace_count != 0:
-        raise ValueError("Could not find matching closing brace for HSK_CHECKPOINT_MAIN array")
+
+    # Find the matching closing brace by hopping from brace to brace
+    # with C-level find: one iteration per brace instead of one per
+    # character, and correct even with nested braces
+    pos = brace_start + 1
+    depth = 1
+    while depth:
+        next_open = content.find(b'{', pos)
+        next_close = content.find(b'}', pos)
+        if next_close == -1:
+            raise ValueError("Could not find matching closing brace for HSK_CHECKPOINT_MAIN array")
+        if next_open != -1 and next_open < next_close:
+            depth += 1
+            pos = next_open + 1
+        else:
+            depth -= 1
+            pos = next_close + 1
+    brace_end = pos - 1
     
     # Extract the array content (between braces)
     array_content = content[brace_start + 1:brace_end]
@@ -118,8 +124,7 @@ def main():
         
         # Verify first 4 bytes are height 136000 (0x00021340 in big-endian)
         if len(checkpoint_data) >= 4:
-            height_bytes = checkpoint_data[0:4]
-            height = (height_bytes[0] << 24) | (height_bytes[1] << 16) | (height_bytes[2] << 8) | height_bytes[3]
+            height = int.from_bytes(checkpoint_data[:4], 'big')
             print(f"Checkpoint height: {height} (expected: 136000)")
             
             if height != 136000: